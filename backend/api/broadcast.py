@@ -0,0 +1,243 @@
+"""
+In-process pub/sub hub used to push event changes to SSE clients.
+
+Views call `publish_event_change()`; the SSE endpoint (see `api/sse.py`)
+subscribes to channels and streams whatever gets published.
+
+Messages are encoded into SSE frames once per publish and fanned out to
+subscriber queues with one callback per event loop, so thousands of idle
+connections cost a queue each and nothing more.
+
+For multi-process deployments set `CEMS_BROADCAST_BACKEND` to
+'api.broadcast.RedisBackend' so a publish in one process reaches
+subscribers in every process.
+"""
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+PUBLIC_CHANNEL = 'events'
+ADMIN_CHANNEL = 'admins'
+
+KEEPALIVE = b': keepalive\n\n'
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+def encode_frame(event_type, data):
+    """
+    Encode one SSE frame.
+    """
+    payload = json.dumps(data, separators=(',', ':'))
+    return f'event: {event_type}\ndata: {payload}\n\n'.encode()
+
+
+class Subscription:
+    """
+    One connected client. Holds a bounded queue of pending frames;
+    slow clients lose their oldest frames instead of growing memory.
+    """
+
+    def __init__(self, channels, maxsize):
+        self.channels = channels
+        self._queue = asyncio.Queue(maxsize)
+
+    def put(self, frame):
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(frame)
+
+    async def get(self):
+        """
+        Next frame to send, or None once the subscription is closed.
+        """
+        return await self._queue.get()
+
+    def close(self):
+        self.put(None)
+
+
+class Broadcast:
+    """
+    Channel -> subscribers registry. Safe to publish from any thread
+    (sync views run in a thread pool under ASGI).
+    """
+
+    def __init__(self, backend=None, backend_options=None, queue_size=100, heartbeat=15):
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._lock = threading.Lock()
+        # loop -> channel -> set of subscriptions
+        self._subscribers = {}
+        backend_class = import_string(backend) if isinstance(backend, str) else (backend or LocalBackend)
+        self.backend = backend_class(self, **(backend_options or {}))
+
+    def publish(self, channel, frame):
+        self.backend.publish(channel, frame)
+
+    def deliver(self, channel, frame):
+        """
+        Hand a frame to every local subscriber of `channel`.
+        Called by the backend.
+        """
+        with self._lock:
+            loops = list(self._subscribers)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        for loop in loops:
+            if loop is running:
+                self._fan_out(loop, channel, frame)
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(self._fan_out, loop, channel, frame)
+
+    def _fan_out(self, loop, channel, frame):
+        for subscription in list(self._subscribers.get(loop, {}).get(channel, ())):
+            subscription.put(frame)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(
+                len(subscriptions)
+                for channels in self._subscribers.values()
+                for subscriptions in channels.values()
+            )
+
+    @asynccontextmanager
+    async def subscribe(self, channels):
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(channels, self.queue_size)
+
+        with self._lock:
+            loop_channels = self._subscribers.get(loop)
+            start_heartbeat = loop_channels is None
+            if start_heartbeat:
+                loop_channels = self._subscribers[loop] = {}
+            for channel in channels:
+                loop_channels.setdefault(channel, set()).add(subscription)
+        if start_heartbeat:
+            loop.create_task(self._heartbeat(loop))
+
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                for channel in channels:
+                    subscriptions = loop_channels.get(channel)
+                    if subscriptions is not None:
+                        subscriptions.discard(subscription)
+                        if not subscriptions:
+                            del loop_channels[channel]
+
+    async def _heartbeat(self, loop):
+        """
+        One timer per event loop keeps every idle connection alive
+        (proxies drop silent connections).
+        """
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            with self._lock:
+                if not self._subscribers.get(loop):
+                    self._subscribers.pop(loop, None)
+                    return
+                subscriptions = {
+                    subscription
+                    for channel_subscriptions in self._subscribers[loop].values()
+                    for subscription in channel_subscriptions
+                }
+            for subscription in subscriptions:
+                subscription.put(KEEPALIVE)
+
+
+class LocalBackend:
+    """
+    Single-process backend: publishes go straight to local subscribers.
+    """
+
+    def __init__(self, hub):
+        self.hub = hub
+
+    def publish(self, channel, frame):
+        self.hub.deliver(channel, frame)
+
+
+class RedisBackend(LocalBackend):
+    """
+    Multi-process backend using Redis pub/sub. Requires the `redis` package.
+
+    CEMS_BROADCAST_OPTIONS = {'url': 'redis://localhost:6379/0'}
+    """
+
+    def __init__(self, hub, url='redis://localhost:6379/0', prefix='cems:'):
+        super().__init__(hub)
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured('RedisBackend requires the "redis" package') from exc
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+        self._listener = threading.Thread(target=self._listen, daemon=True)
+        self._listener.start()
+
+    def publish(self, channel, frame):
+        self.client.publish(self.prefix + channel, frame)
+
+    def _listen(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(self.prefix + '*')
+        for message in pubsub.listen():
+            channel = message['channel'].decode()[len(self.prefix):]
+            self.hub.deliver(channel, message['data'])
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_hub():
+    """
+    Process-wide hub, configured from settings on first use.
+    """
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = Broadcast(
+                    backend=getattr(settings, 'CEMS_BROADCAST_BACKEND', None),
+                    backend_options=getattr(settings, 'CEMS_BROADCAST_OPTIONS', None),
+                )
+    return _hub
+
+
+def publish_event_change(event_id, creator_id, action, is_approved, was_approved=False):
+    """
+    Push an event lifecycle change to interested clients, once the
+    current transaction commits (so a client refetching on the message
+    sees the change).
+
+    Admins see everything, the creator sees changes to their own events,
+    and everyone else only hears about events that are (or were) public.
+    Each client is subscribed so it receives a given change exactly once.
+    """
+    frame = encode_frame(f'event.{action}', {'id': event_id, 'is_approved': is_approved})
+
+    def publish():
+        hub = get_hub()
+        hub.publish(ADMIN_CHANNEL, frame)
+        if is_approved or was_approved:
+            hub.publish(PUBLIC_CHANNEL, frame)
+        else:
+            hub.publish(user_channel(creator_id), frame)
+
+    transaction.on_commit(publish)
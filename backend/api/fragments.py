@@ -0,0 +1,190 @@
+"""
+Per-event fragment cache.
+
+Each event's own serialized fields (EventFragmentSerializer) are cached
+under (id, updated_at), so an edit or approval only invalidates that one
+event. List responses are assembled with one cache.get_many and only
+missing/stale events are re-serialized.
+
+Fields that live on other rows (creator name/email, venue name) are not
+cached: they come from the same query that lists the event ids, so
+renaming a user or venue shows up immediately.
+
+is_saved comes from a cached set of the user's saved event IDs, dropped
+by SavedEventToggleView whenever the user saves or unsaves an event.
+
+Hits and misses are counted in memory and added to CacheCounter rows
+at most every STATS_FLUSH_INTERVAL seconds per process, so serving a
+request never writes anything just for the stats.
+"""
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F
+
+from .models import CacheCounter, Event, SavedEvent
+from .serializers import EventFragmentSerializer
+
+logger = logging.getLogger(__name__)
+
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+SAVED_IDS_TIMEOUT = 60 * 60
+
+STATS_NAMES = ('fragments', 'saved_ids')
+# Seconds between writes of a process's buffered counts
+STATS_FLUSH_INTERVAL = 10
+
+# name -> [hits, misses] not yet written to CacheCounter
+_pending_stats = {}
+_stats_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+# Columns render_events() needs per event, in row order
+EVENT_ROW_FIELDS = ('id', 'updated_at', 'creator__username', 'creator__email', 'venue__name')
+
+
+def event_row_fields(prefix=''):
+    """
+    EVENT_ROW_FIELDS for a values_list() on a model related to Event,
+    e.g. event_row_fields('event__') on SavedEvent.
+    """
+    return [prefix + field for field in EVENT_ROW_FIELDS]
+
+
+def fragment_key(event_id, updated_at):
+    return f'event-fragment:{event_id}:{int(updated_at.timestamp() * 1_000_000)}'
+
+
+def saved_ids_key(user_id):
+    return f'saved-event-ids:{user_id}'
+
+
+def _count(name, hits=0, misses=0):
+    with _stats_lock:
+        pending = _pending_stats.setdefault(name, [0, 0])
+        pending[0] += hits
+        pending[1] += misses
+        due = time.monotonic() - _last_flush >= STATS_FLUSH_INTERVAL
+    if due:
+        flush_cache_stats()
+
+
+def _add_to_counter(name, hits, misses):
+    counters = CacheCounter.objects.filter(name=name)
+    if counters.update(hits=F('hits') + hits, misses=F('misses') + misses):
+        return
+    try:
+        with transaction.atomic():
+            CacheCounter.objects.create(name=name, hits=hits, misses=misses)
+    except IntegrityError:
+        # Another process created the row first
+        counters.update(hits=F('hits') + hits, misses=F('misses') + misses)
+
+
+def flush_cache_stats():
+    """
+    Add this process's pending hit/miss counts to the CacheCounter rows.
+    A failed write is logged and its counts dropped; stats never fail
+    the request that triggered the flush.
+    """
+    global _last_flush
+    with _stats_lock:
+        pending = {name: counts for name, counts in _pending_stats.items() if any(counts)}
+        _pending_stats.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+    try:
+        with transaction.atomic():
+            for name, (hits, misses) in pending.items():
+                _add_to_counter(name, hits, misses)
+    except DatabaseError:
+        logger.exception('Could not save cache stats')
+
+
+def render_events(rows, saved_ids=frozenset()):
+    """
+    Serialized events for `rows`, a list of EVENT_ROW_FIELDS tuples in
+    the order they should be returned.
+    """
+    keys = {row[0]: fragment_key(row[0], row[1]) for row in rows}
+    fragments = cache.get_many(list(keys.values()))
+
+    missing = [event_id for event_id, key in keys.items() if key not in fragments]
+    if missing:
+        fresh = {}
+        for event in Event.objects.filter(id__in=missing):
+            data = EventFragmentSerializer(event).data
+            key = fragment_key(event.id, event.updated_at)
+            fresh[key] = data
+            # Keep the row even if the event changed since `rows` was read
+            keys[event.id] = key
+        cache.set_many(fresh, FRAGMENT_TIMEOUT)
+        fragments.update(fresh)
+
+    _count('fragments', hits=len(keys) - len(missing), misses=len(missing))
+
+    return [
+        {
+            **fragments[keys[event_id]],
+            'creator_name': creator_name,
+            'creator_email': creator_email,
+            'venue_name': venue_name,
+            'is_saved': event_id in saved_ids,
+        }
+        for event_id, _, creator_name, creator_email, venue_name in rows
+        if keys[event_id] in fragments  # Skip events deleted meanwhile
+    ]
+
+
+def saved_event_ids(user):
+    """
+    IDs of the events `user` has saved.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+
+    ids = cache.get(saved_ids_key(user.id))
+    if ids is not None:
+        _count('saved_ids', hits=1)
+        return set(ids)
+
+    _count('saved_ids', misses=1)
+    ids = set(SavedEvent.objects.filter(user=user).values_list('event_id', flat=True))
+    cache.set(saved_ids_key(user.id), list(ids), SAVED_IDS_TIMEOUT)
+    return ids
+
+
+def invalidate_saved_event_ids(user_id):
+    """
+    Forget the user's cached saved IDs after a save/unsave. Deleting
+    (rather than patching the cached set) can't lose concurrent updates.
+    """
+    cache.delete(saved_ids_key(user_id))
+
+
+def cache_stats():
+    """
+    Hit/miss counters for the fragment and saved-ID caches. Includes this
+    process's pending counts; other processes' may lag by up to
+    STATS_FLUSH_INTERVAL seconds.
+    """
+    flush_cache_stats()
+    counters = {
+        name: (hits, misses)
+        for name, hits, misses in CacheCounter.objects.values_list('name', 'hits', 'misses')
+    }
+    stats = {}
+    for name in STATS_NAMES:
+        hits, misses = counters.get(name, (0, 0))
+        total = hits + misses
+        stats[name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+        }
+    return stats
@@ -0,0 +1,205 @@
+"""
+Small DB-backed job queue.
+
+Views call `enqueue()` so side effects (emails, cache invalidation, ...)
+don't run inside the request. `manage.py run_workers` claims pending jobs
+in batches and runs the handler registered for each job name.
+"""
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+# Retry delay is RETRY_BASE_SECONDS * 2 ** attempts (capped)
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 60 * 60
+
+# Running jobs older than this are assumed to belong to a dead worker
+LOCK_TIMEOUT = timedelta(minutes=10)
+
+EVENTS_CACHE_VERSION_KEY = 'events:version'
+
+_handlers = {}
+
+
+def job_handler(name):
+    """
+    Register a function as the handler for jobs called `name`.
+    The handler is called with the job payload as keyword arguments.
+    """
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, run_at=None, max_attempts=5, **payload):
+    """
+    Add a job to the queue. Payload must be JSON serializable.
+    """
+    if name not in _handlers:
+        raise ValueError(f'No handler registered for job "{name}"')
+    return Job.objects.create(
+        name=name,
+        payload=payload,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts,
+    )
+
+
+def claim_jobs(batch_size=10):
+    """
+    Claim up to `batch_size` runnable jobs for this worker.
+
+    Claiming is a single conditional UPDATE tagged with a unique token,
+    so two workers can never claim the same job even on databases
+    without row locking (SQLite).
+    """
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    runnable = (
+        Q(status=Job.STATUS_PENDING, run_at__lte=now)
+        | Q(status=Job.STATUS_RUNNING, locked_at__lt=now - LOCK_TIMEOUT)
+    )
+    candidate_ids = list(
+        Job.objects.filter(runnable).order_by('run_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not candidate_ids:
+        return []
+
+    Job.objects.filter(runnable, id__in=candidate_ids).update(
+        status=Job.STATUS_RUNNING,
+        locked_by=token,
+        locked_at=now,
+        updated_at=now,
+    )
+    return list(Job.objects.filter(locked_by=token, status=Job.STATUS_RUNNING))
+
+
+def run_job(job):
+    """
+    Run one claimed job and record the outcome.
+    Failed jobs are retried with exponential backoff until max_attempts.
+
+    The outcome is only written if this worker still holds the claim; a
+    job that ran past LOCK_TIMEOUT may have been reclaimed by another
+    worker, which then owns its status.
+    """
+    token = job.locked_by
+    handler = _handlers.get(job.name)
+    job.attempts += 1
+    try:
+        if handler is None:
+            raise LookupError(f'No handler registered for job "{job.name}"')
+        handler(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.STATUS_FAILED
+            logger.error('Job %s (%s) failed permanently', job.id, job.name)
+        else:
+            delay = min(RETRY_BASE_SECONDS * 2 ** job.attempts, RETRY_MAX_SECONDS)
+            job.status = Job.STATUS_PENDING
+            job.run_at = timezone.now() + timedelta(seconds=delay)
+            logger.warning('Job %s (%s) failed, retrying in %ss', job.id, job.name, delay)
+    else:
+        job.status = Job.STATUS_DONE
+        job.last_error = ''
+
+    job.locked_by = ''
+    job.locked_at = None
+    finalized = Job.objects.filter(id=job.id, locked_by=token).update(
+        status=job.status,
+        attempts=job.attempts,
+        run_at=job.run_at,
+        locked_by='',
+        locked_at=None,
+        last_error=job.last_error,
+        updated_at=timezone.now(),
+    )
+    if not finalized:
+        logger.warning('Job %s (%s) was reclaimed by another worker, result dropped', job.id, job.name)
+    return job
+
+
+# ==================== EVENT LIFECYCLE JOBS ====================
+
+def enqueue_event_changed(event_id, event_title, action, saved_user_ids=None):
+    """
+    Queue the side effects of an event being created/approved/rejected/deleted.
+    `saved_user_ids` must be passed for deletes since the SavedEvent rows
+    are gone by the time the job runs.
+
+    Jobs are enqueued on commit, so a worker can never invalidate caches
+    before the change they are about is visible.
+    """
+    def enqueue_jobs():
+        enqueue('invalidate_event_caches')
+        if action in ('approved', 'rejected', 'deleted'):
+            enqueue(
+                'notify_saved_users',
+                event_title=event_title,
+                action=action,
+                user_ids=saved_user_ids,
+                event_id=event_id,
+            )
+
+    transaction.on_commit(enqueue_jobs)
+
+
+@job_handler('invalidate_event_caches')
+def invalidate_event_caches():
+    """
+    Bump the events cache version so every versioned event cache key
+    (see `events_cache_version()`) goes stale at once.
+
+    The version lives in the small 'counters' cache, which is never culled,
+    so it can't fall back to an old value while stale entries survive.
+    """
+    counters = caches['counters']
+    try:
+        counters.incr(EVENTS_CACHE_VERSION_KEY)
+    except ValueError:
+        counters.set(EVENTS_CACHE_VERSION_KEY, 2, timeout=None)
+
+
+def events_cache_version():
+    """
+    Current version number to embed in cache keys derived from events.
+    """
+    return caches['counters'].get_or_set(EVENTS_CACHE_VERSION_KEY, 1, timeout=None)
+
+
+@job_handler('notify_saved_users')
+def notify_saved_users(event_title, action, event_id=None, user_ids=None):
+    """
+    Email everyone who saved an event about a change to it.
+    """
+    if user_ids is None:
+        users = User.objects.filter(saved_events__event_id=event_id)
+    else:
+        users = User.objects.filter(id__in=user_ids)
+    recipients = list(users.values_list('email', flat=True))
+    if not recipients:
+        return
+
+    EmailMessage(
+        subject=f'Event "{event_title}" was {action}',
+        body=f'An event you saved, "{event_title}", was {action}.',
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        bcc=recipients,
+    ).send()
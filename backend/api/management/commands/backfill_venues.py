@@ -0,0 +1,74 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models.functions import Now
+
+from api.jobs import invalidate_event_caches
+from api.models import Event, Venue, normalize_venue_name
+
+
+class Command(BaseCommand):
+    """
+    python manage.py backfill_venues --batch-size 1000
+
+    Link existing events to venues, deduping Event.location strings by
+    their normalized name. Safe to re-run: only events without a venue
+    are touched.
+    """
+    help = 'Create venues from event locations and link events to them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Events processed per transaction')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        linked = 0
+
+        while True:
+            batch = list(
+                Event.objects.filter(venue__isnull=True, id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'location')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            with transaction.atomic():
+                linked += self.link_batch(batch)
+            self.stdout.write(f'Linked {linked} events...')
+
+        invalidate_event_caches()
+        self.stdout.write(self.style.SUCCESS(
+            f'Done. {linked} events linked to {Venue.objects.count()} venues.'
+        ))
+
+    def link_batch(self, batch):
+        """
+        Link one batch of (id, location) rows using a fixed number of queries.
+        """
+        names = {}
+        for _, location in batch:
+            names.setdefault(normalize_venue_name(location), ' '.join(location.split()))
+
+        Venue.objects.bulk_create(
+            [Venue(name=name, normalized_name=normalized) for normalized, name in names.items()],
+            ignore_conflicts=True,
+        )
+        venue_ids = dict(
+            Venue.objects.filter(normalized_name__in=names)
+            .values_list('normalized_name', 'id')
+        )
+
+        event_ids_by_venue = defaultdict(list)
+        for event_id, location in batch:
+            event_ids_by_venue[venue_ids[normalize_venue_name(location)]].append(event_id)
+        for venue_id, event_ids in event_ids_by_venue.items():
+            # update() skips auto_now; bump updated_at so cached fragments
+            # (keyed by it) are replaced rather than served stale
+            Event.objects.filter(id__in=event_ids).update(venue_id=venue_id, updated_at=Now())
+
+        return len(batch)
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.provisioning import provision_users, read_roster
+
+
+class Command(BaseCommand):
+    """
+    python manage.py import_users roster.csv
+
+    Create users from a CSV roster with email, username and password columns.
+    Invalid rows and duplicate emails are reported; the rest are imported.
+    """
+    help = 'Bulk create users from a CSV roster'
+
+    def add_arguments(self, parser):
+        parser.add_argument('roster', help='Path to the roster CSV file')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Users inserted per bulk_create')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Password hashing processes (default: available cores)')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['roster'], newline='', encoding='utf-8-sig') as roster:
+                rows = read_roster(roster)
+        except OSError as exc:
+            raise CommandError(f'Cannot read roster: {exc}')
+
+        report = provision_users(
+            rows,
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+        )
+
+        for duplicate in report['duplicates']:
+            self.stdout.write(self.style.WARNING(
+                f"Row {duplicate['row']}: {duplicate['email']} already exists, skipped"
+            ))
+        for error in report['errors']:
+            messages = '; '.join(
+                f"{field}: {' '.join(str(message) for message in field_messages)}"
+                for field, field_messages in error['errors'].items()
+            )
+            self.stdout.write(self.style.ERROR(f"Row {error['row']}: {messages}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report['created']} of {len(rows)} users "
+            f"({len(report['duplicates'])} duplicates, {len(report['errors'])} errors)"
+        ))
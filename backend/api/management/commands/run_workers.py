@@ -0,0 +1,89 @@
+import logging
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from api.jobs import claim_jobs, run_job
+
+logger = logging.getLogger(__name__)
+
+# Longest pause after repeated database errors
+MAX_ERROR_BACKOFF = 60
+
+
+class Command(BaseCommand):
+    """
+    python manage.py run_workers --concurrency 4
+
+    Process background jobs queued by the API views.
+    Each worker thread claims jobs in batches and runs them.
+    """
+    help = 'Run background job workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=1,
+                            help='Number of worker threads')
+        parser.add_argument('--batch-size', type=int, default=10,
+                            help='Jobs claimed per database round trip')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue once and exit')
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        concurrency = max(options['concurrency'], 1)
+
+        threads = [
+            threading.Thread(
+                target=self.work,
+                args=(options['batch_size'], options['poll_interval'], options['once']),
+                name=f'worker-{i}',
+                daemon=True,
+            )
+            for i in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+
+        self.stdout.write(f'Started {concurrency} worker(s)')
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping workers...')
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+
+    def work(self, batch_size, poll_interval, once):
+        """
+        Worker loop: claim a batch, run it, sleep if there was nothing to do.
+        Database errors (e.g. SQLite "database is locked") are logged and
+        retried with backoff instead of killing the thread.
+        """
+        errors = 0
+        try:
+            while not self.stop.is_set():
+                try:
+                    close_old_connections()
+                    jobs = claim_jobs(batch_size)
+                    if not jobs:
+                        if once:
+                            return
+                        self.stop.wait(poll_interval)
+                        continue
+                    for job in jobs:
+                        job = run_job(job)
+                        self.stdout.write(f'[{job.status}] {job.name} #{job.id}')
+                    errors = 0
+                except Exception:
+                    errors += 1
+                    delay = min(poll_interval * 2 ** errors, MAX_ERROR_BACKOFF)
+                    logger.exception('Worker error, retrying in %ss', delay)
+                    connection.close()
+                    self.stop.wait(delay)
+        finally:
+            connection.close()
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-19 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_venue'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='venue',
+            name='normalized_name',
+            field=models.CharField(max_length=900, unique=True),
+        ),
+    ]
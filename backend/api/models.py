@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 
 class User(AbstractUser):
@@ -17,6 +18,42 @@ class User(AbstractUser):
         return self.email
 
 
+def normalize_venue_name(name):
+    """
+    Canonical form used to dedupe venues:
+    "  main   HALL " and "Main Hall" both become "main hall".
+    """
+    return ' '.join(name.split()).casefold()
+
+
+class Venue(models.Model):
+    """
+    A place where events happen. Event.location strings are deduped
+    into venues by their normalized name.
+    """
+    name = models.CharField(max_length=300)
+    # casefold() can expand a character up to 3x ('ﬃ' -> 'ffi'), so this
+    # must hold 3x Event.location's max_length
+    normalized_name = models.CharField(max_length=900, unique=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def for_location(cls, location):
+        """
+        Get or create the venue for a free-text location.
+        """
+        venue, _ = cls.objects.get_or_create(
+            normalized_name=normalize_venue_name(location),
+            defaults={'name': ' '.join(location.split())},
+        )
+        return venue
+
+
 class Event(models.Model):
     """
     Event model - represents events in your system.
@@ -25,6 +62,7 @@ class Event(models.Model):
     description = models.TextField()
     date = models.DateTimeField()
     location = models.CharField(max_length=300)
+    venue = models.ForeignKey(Venue, on_delete=models.SET_NULL, null=True, blank=True, related_name='events')
     creator = models.ForeignKey(User, on_delete=models.CASCADE, related_name='events')
     is_approved = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -50,3 +88,54 @@ class SavedEvent(models.Model):
     
     def __str__(self):
         return f"{self.user.email} saved {self.event.title}"
+
+
+class Job(models.Model):
+    """
+    A unit of background work (notifications, cache invalidation, ...).
+    Views enqueue jobs; `manage.py run_workers` claims and runs them.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=64, blank=True, default='')
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_at']),  # Worker claim query
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+class CacheCounter(models.Model):
+    """
+    Hit/miss totals for one of the caches in api/fragments.py.
+    Processes count in memory and add their totals here periodically.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    hits = models.PositiveBigIntegerField(default=0)
+    misses = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.hits} hits, {self.misses} misses"
@@ -0,0 +1,193 @@
+"""
+Bulk user provisioning from roster files (CSV with email, username,
+password columns).
+
+Rows are validated with the signup rules, password hashing (the slow
+part: one PBKDF2 per user) is spread over a process pool, and users are
+inserted with bulk_create in batches. Bad rows and duplicate emails are
+reported instead of aborting the import.
+"""
+import csv
+import io
+import os
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+
+from .serializers import UserSignupSerializer
+
+User = get_user_model()
+
+
+class RosterUserSerializer(UserSignupSerializer):
+    """
+    Signup validation without the per-row uniqueness queries;
+    uniqueness is checked for the whole roster at once.
+    """
+    class Meta(UserSignupSerializer.Meta):
+        extra_kwargs = {
+            'email': {'validators': []},
+            'username': {'validators': [User.username_validator]},
+        }
+
+
+def read_roster(file, limit=None):
+    """
+    Parse a roster CSV (text or binary file) into a list of row dicts.
+    Stops reading after `limit` rows if given.
+    """
+    if isinstance(file.read(0), bytes):
+        file = io.TextIOWrapper(file, encoding='utf-8-sig')
+    return [
+        {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        for row in islice(csv.DictReader(file), limit)
+    ]
+
+
+def _init_worker():
+    """
+    Make sure Django settings are available in pool processes that were
+    spawned rather than forked (macOS/Windows).
+    """
+    from django.conf import settings
+    if not settings.configured:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cems_backend.settings')
+        import django
+        django.setup()
+
+
+def available_cores():
+    """
+    CPUs this process may run on (respects affinity/cgroup pinning where
+    the OS exposes it).
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _existing(field, values, chunk_size=500):
+    """
+    Which of `values` already exist in User.<field>, in chunked IN queries.
+    """
+    values = list(values)
+    found = set()
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        found.update(User.objects.filter(**{f'{field}__in': chunk}).values_list(field, flat=True))
+    return found
+
+
+def provision_users(rows, batch_size=1000, workers=None):
+    """
+    Create users from roster rows.
+
+    Returns a report: {'created': int, 'duplicates': [...], 'errors': [...]}.
+    Row numbers in the report are 1-based data rows.
+    """
+    report = {'created': 0, 'duplicates': [], 'errors': []}
+
+    # Validate every row with the signup rules (no database access)
+    valid = []
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            report['errors'].append({
+                'row': number,
+                'errors': {'non_field_errors': ['Expected an object with email, username and password.']},
+            })
+            continue
+        data = dict(row)
+        data.setdefault('password2', data.get('password'))
+        serializer = RosterUserSerializer(data=data)
+        if not serializer.is_valid():
+            report['errors'].append({'row': number, 'errors': serializer.errors})
+            continue
+        attrs = serializer.validated_data
+        valid.append((
+            number,
+            User.objects.normalize_email(attrs['email']),
+            User.normalize_username(attrs['username']),
+            attrs['password'],
+        ))
+
+    # Drop duplicates, within the roster and against existing users
+    existing_emails = _existing('email', {email for _, email, _, _ in valid})
+    existing_usernames = _existing('username', {username for _, _, username, _ in valid})
+    seen_emails, seen_usernames = set(), set()
+    pending = []
+    for number, email, username, password in valid:
+        if email in existing_emails or email in seen_emails:
+            report['duplicates'].append({'row': number, 'email': email})
+            continue
+        if username in existing_usernames or username in seen_usernames:
+            report['errors'].append({
+                'row': number,
+                'errors': {'username': ['A user with that username already exists.']},
+            })
+            continue
+        seen_emails.add(email)
+        seen_usernames.add(username)
+        pending.append((number, email, username, password))
+
+    if not pending:
+        return report
+
+    # Hash in parallel and insert as results stream back in order.
+    # No pool for a single worker: forking costs more than it saves.
+    workers = min(workers or available_cores(), len(pending))
+    passwords = [row[3] for row in pending]
+    batch = []
+
+    def insert(hashes):
+        nonlocal batch
+        for (number, email, username, _), password_hash in zip(pending, hashes):
+            batch.append((number, User(email=email, username=username, password=password_hash)))
+            if len(batch) >= batch_size:
+                _insert_batch(batch, report)
+                batch = []
+
+    if workers == 1:
+        insert(map(make_password, passwords))
+    else:
+        chunksize = max(1, min(100, len(pending) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            insert(executor.map(make_password, passwords, chunksize=chunksize))
+    if batch:
+        _insert_batch(batch, report)
+
+    return report
+
+
+def _insert_batch(batch, report):
+    """
+    bulk_create one batch. If a concurrent signup took one of the emails
+    or usernames meanwhile, fall back to row-by-row inserts for this batch
+    only and report which constraint each failing row hit.
+    """
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create([user for _, user in batch])
+        report['created'] += len(batch)
+        return
+    except IntegrityError:
+        pass
+
+    for number, user in batch:
+        user.pk = None
+        try:
+            with transaction.atomic():
+                user.save()
+            report['created'] += 1
+        except IntegrityError as exc:
+            if User.objects.filter(email=user.email).exists():
+                report['duplicates'].append({'row': number, 'email': user.email})
+            elif User.objects.filter(username=user.username).exists():
+                report['errors'].append({
+                    'row': number,
+                    'errors': {'username': ['A user with that username already exists.']},
+                })
+            else:
+                report['errors'].append({'row': number, 'errors': {'non_field_errors': [str(exc)]}})
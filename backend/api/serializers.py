@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Event, SavedEvent
+from .models import Event, SavedEvent, Venue
 from django.contrib.auth.password_validation import validate_password
 
 User = get_user_model()
@@ -71,15 +71,11 @@ class UserSerializer(serializers.ModelSerializer):
 
 # Event serializer classes
 
-class EventSerializer(serializers.ModelSerializer):
+class EventFragmentSerializer(serializers.ModelSerializer):
     """
-    Serializer for Event model.
-    Shows event details including creator info.
+    Event fields that only change when the event itself is saved
+    (so they can be cached under its updated_at; see api/fragments.py).
     """
-    creator_name = serializers.CharField(source='creator.username', read_only=True)
-    creator_email = serializers.CharField(source='creator.email', read_only=True)
-    is_saved = serializers.SerializerMethodField()
-    
     class Meta:
         model = Event
         fields = [
@@ -88,15 +84,32 @@ class EventSerializer(serializers.ModelSerializer):
             'description',
             'date',
             'location',
+            'venue',
             'creator',
-            'creator_name',
-            'creator_email',
             'is_approved',
-            'is_saved',
             'created_at',
             'updated_at'
         ]
-        read_only_fields = ['id', 'creator', 'created_at', 'updated_at', 'is_approved']
+        read_only_fields = ['id', 'creator', 'venue', 'created_at', 'updated_at', 'is_approved']
+
+
+class EventSerializer(EventFragmentSerializer):
+    """
+    Serializer for Event model.
+    Shows event details including creator info.
+    """
+    creator_name = serializers.CharField(source='creator.username', read_only=True)
+    creator_email = serializers.CharField(source='creator.email', read_only=True)
+    venue_name = serializers.CharField(source='venue.name', read_only=True, allow_null=True)
+    is_saved = serializers.SerializerMethodField()
+    
+    class Meta(EventFragmentSerializer.Meta):
+        fields = EventFragmentSerializer.Meta.fields + [
+            'creator_name',
+            'creator_email',
+            'venue_name',
+            'is_saved'
+        ]
     
     def get_is_saved(self, obj):
         """
@@ -127,6 +140,7 @@ class EventCreateSerializer(serializers.ModelSerializer):
         """
         request = self.context.get('request')
         validated_data['creator'] = request.user
+        validated_data['venue'] = Venue.for_location(validated_data['location'])
         validated_data['is_approved'] = False  # Needs admin approval
         return super().create(validated_data)
 
@@ -0,0 +1,134 @@
+"""
+GET /api/events/stream/
+
+Server-Sent Events stream of event changes, served straight from ASGI
+(see `cems_backend/asgi.py`) so each idle client costs a coroutine, not a
+worker thread. Clients use it instead of polling /api/events/.
+
+Authentication is optional: pass the access token as `?token=<jwt>`
+(EventSource can't set headers) or as an `Authorization: Bearer` header.
+
+- anonymous: changes to public (approved) events
+- logged in: the above plus changes to your own pending events
+- admin: every change, including new submissions
+"""
+import asyncio
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .broadcast import ADMIN_CHANNEL, PUBLIC_CHANNEL, get_hub, user_channel
+
+STREAM_PATH = '/api/events/stream/'
+
+
+class EventStreamApp:
+    """
+    ASGI wrapper that serves the event stream and passes every other
+    request through to Django.
+    """
+
+    def __init__(self, django_app, hub=None):
+        self.django_app = django_app
+        self.hub = hub
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == STREAM_PATH:
+            await self.stream(scope, receive, send)
+        else:
+            await self.django_app(scope, receive, send)
+
+    async def stream(self, scope, receive, send):
+        headers = self.cors_headers(scope)
+
+        if scope['method'] == 'OPTIONS':
+            await self.respond(send, 204, b'', headers)
+            return
+        if scope['method'] != 'GET':
+            await self.respond(send, 405, b'{"error": "Method not allowed"}', headers)
+            return
+
+        try:
+            user = await self.authenticate(scope)
+        except (InvalidToken, AuthenticationFailed):
+            await self.respond(send, 401, b'{"error": "Invalid token"}', headers)
+            return
+
+        if user is None:
+            channels = [PUBLIC_CHANNEL]
+        elif user.is_admin:
+            channels = [ADMIN_CHANNEL]
+        else:
+            channels = [PUBLIC_CHANNEL, user_channel(user.id)]
+
+        hub = self.hub or get_hub()
+        async with hub.subscribe(channels) as subscription:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': headers + [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),  # Stop nginx buffering the stream
+                ],
+            })
+            await send({'type': 'http.response.body', 'body': b'retry: 5000\n\n', 'more_body': True})
+
+            watcher = asyncio.ensure_future(self.wait_for_disconnect(receive, subscription))
+            try:
+                while True:
+                    frame = await subscription.get()
+                    if frame is None:
+                        break
+                    await send({'type': 'http.response.body', 'body': frame, 'more_body': True})
+            finally:
+                watcher.cancel()
+
+    async def wait_for_disconnect(self, receive, subscription):
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                subscription.close()
+                return
+
+    async def authenticate(self, scope):
+        """
+        Return the user for the request's token, or None if there is no token.
+        """
+        query = parse_qs(scope.get('query_string', b'').decode())
+        raw_token = query.get('token', [None])[0]
+        if raw_token is None:
+            header = dict(scope['headers']).get(b'authorization', b'').split()
+            if len(header) == 2 and header[0].lower() == b'bearer':
+                raw_token = header[1].decode()
+        if not raw_token:
+            return None
+
+        auth = JWTAuthentication()
+        validated_token = auth.get_validated_token(raw_token)
+        return await sync_to_async(auth.get_user)(validated_token)
+
+    def cors_headers(self, scope):
+        """
+        Mirror django-cors-headers, which never sees these requests.
+        """
+        origin = dict(scope['headers']).get(b'origin', b'').decode()
+        if origin in getattr(settings, 'CORS_ALLOWED_ORIGINS', []):
+            return [
+                (b'access-control-allow-origin', origin.encode()),
+                (b'access-control-allow-headers', b'authorization'),
+                (b'vary', b'origin'),
+            ]
+        return []
+
+    async def respond(self, send, status, body, headers):
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers + [(b'content-type', b'application/json')],
+        })
+        await send({'type': 'http.response.body', 'body': body})
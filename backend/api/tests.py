@@ -1,3 +1,724 @@
-from django.test import TestCase
+import asyncio
+import io
+import threading
+import time
+from types import SimpleNamespace
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache, caches
+from django.core import mail
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIClient
+
+from .broadcast import PUBLIC_CHANNEL, Broadcast, encode_frame, publish_event_change
+from .jobs import (
+    LOCK_TIMEOUT, RETRY_BASE_SECONDS, claim_jobs, enqueue, events_cache_version,
+    invalidate_event_caches, job_handler, run_job,
+)
+from .management.commands.run_workers import Command as RunWorkersCommand
+from . import fragments
+from .fragments import cache_stats, flush_cache_stats
+from .models import CacheCounter, Event, Job, SavedEvent, User, Venue
+from .provisioning import provision_users, read_roster
+from .sse import STREAM_PATH, EventStreamApp
+
+# Each test class gets its own in-memory caches instead of the shared file cache
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'counters': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-counters'},
+}
+
+
+@job_handler('test_ok')
+def ok_job(**payload):
+    pass
+
+
+@job_handler('test_fail')
+def failing_job(**payload):
+    raise RuntimeError('boom')
+
+
+# ==================== JOB QUEUE ====================
+
+@override_settings(CACHES=TEST_CACHES)
+class JobQueueTests(TestCase):
+
+    def test_enqueue_rejects_unknown_jobs(self):
+        with self.assertRaises(ValueError):
+            enqueue('no_such_job')
+
+    def test_claim_takes_each_job_once(self):
+        for _ in range(3):
+            enqueue('test_ok')
+
+        first = claim_jobs(batch_size=2)
+        second = claim_jobs(batch_size=2)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertEqual(claim_jobs(batch_size=2), [])
+        self.assertTrue(all(job.status == Job.STATUS_RUNNING for job in first + second))
+        self.assertNotEqual(first[0].locked_by, second[0].locked_by)
+
+    def test_future_jobs_are_not_claimed(self):
+        enqueue('test_ok', run_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(claim_jobs(), [])
+
+    def test_successful_job_is_done(self):
+        enqueue('test_ok', value=1)
+        run_job(claim_jobs()[0])
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.STATUS_DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.locked_by, '')
+
+    def test_failed_job_is_retried_with_backoff(self):
+        enqueue('test_fail')
+        before = timezone.now()
+        with self.assertLogs('api.jobs', 'WARNING'):
+            run_job(claim_jobs()[0])
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.STATUS_PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('boom', job.last_error)
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=RETRY_BASE_SECONDS * 2))
+        self.assertEqual(claim_jobs(), [])  # Not runnable until the backoff passes
+
+    def test_job_fails_permanently_after_max_attempts(self):
+        enqueue('test_fail', max_attempts=2)
+        with self.assertLogs('api.jobs', 'WARNING') as logs:
+            for _ in range(2):
+                Job.objects.update(run_at=timezone.now())
+                run_job(claim_jobs()[0])
+        self.assertIn('failed permanently', logs.output[-1])
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_stale_running_job_is_reclaimed(self):
+        enqueue('test_ok')
+        claimed = claim_jobs()[0]
+        Job.objects.update(locked_at=timezone.now() - LOCK_TIMEOUT - timedelta(minutes=1))
+
+        reclaimed = claim_jobs()
+
+        self.assertEqual([job.id for job in reclaimed], [claimed.id])
+        self.assertNotEqual(reclaimed[0].locked_by, claimed.locked_by)
+
+    def test_reclaimed_job_keeps_new_owners_state(self):
+        enqueue('test_fail')
+        claimed = claim_jobs()[0]
+        Job.objects.update(locked_by='other-worker')
+
+        with self.assertLogs('api.jobs', 'WARNING') as logs:
+            run_job(claimed)
+        self.assertIn('reclaimed', logs.output[-1])
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.STATUS_RUNNING)
+        self.assertEqual(job.locked_by, 'other-worker')
+        self.assertEqual(job.attempts, 0)
+
+    def test_invalidate_event_caches_bumps_version(self):
+        version = events_cache_version()
+        invalidate_event_caches()
+        self.assertEqual(events_cache_version(), version + 1)
+
+
+class RunWorkersTests(SimpleTestCase):
+
+    @mock.patch('api.management.commands.run_workers.connection')
+    @mock.patch('api.management.commands.run_workers.close_old_connections')
+    @mock.patch('api.management.commands.run_workers.claim_jobs')
+    def test_worker_survives_database_errors(self, claim, close_old, connection):
+        claim.side_effect = [OperationalError('database is locked'), []]
+        command = RunWorkersCommand()
+        command.stop = threading.Event()
+
+        with self.assertLogs('api.management.commands.run_workers', 'ERROR'):
+            command.work(batch_size=10, poll_interval=0, once=True)
+
+        self.assertEqual(claim.call_count, 2)
+        self.assertTrue(connection.close.called)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class EventLifecycleJobTests(TestCase):
+    """
+    Event views only enqueue their side effects; the work happens in run_job.
+    """
+
+    def setUp(self):
+        self.creator = User.objects.create_user(email='creator@example.com', username='creator', password='pw')
+        self.saver = User.objects.create_user(email='saver@example.com', username='saver', password='pw')
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='pw', is_admin=True
+        )
+        self.event = Event.objects.create(
+            title='Hackathon', description='...', date=timezone.now(),
+            location='Lab', creator=self.creator, is_approved=True,
+        )
+        SavedEvent.objects.create(user=self.saver, event=self.event)
+        self.client = APIClient()
+
+    def run_all_jobs(self):
+        for job in claim_jobs(batch_size=100):
+            run_job(job)
+
+    def test_create_enqueues_cache_invalidation(self):
+        self.client.force_authenticate(self.creator)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/events/create/', {
+                'title': 'New', 'description': '...',
+                'date': '2030-01-01T10:00:00Z', 'location': 'Lab',
+            }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(list(Job.objects.values_list('name', flat=True)), ['invalidate_event_caches'])
+
+        version = events_cache_version()
+        self.run_all_jobs()
+        self.assertEqual(events_cache_version(), version + 1)
+
+    def test_reject_notifies_savers_from_the_worker(self):
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f'/api/events/{self.event.id}/approve/', {'is_approved': False}, format='json'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(Job.objects.values_list('name', flat=True)),
+            ['invalidate_event_caches', 'notify_saved_users'],
+        )
+        self.assertEqual(mail.outbox, [])
+
+        self.run_all_jobs()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Event "Hackathon" was rejected')
+        self.assertEqual(mail.outbox[0].bcc, ['saver@example.com'])
+        self.assertFalse(Job.objects.exclude(status=Job.STATUS_DONE).exists())
+
+    def test_delete_enqueues_after_delete_with_saved_users(self):
+        event_id = self.event.id
+        self.client.force_authenticate(self.creator)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/events/{event_id}/delete/')
+            self.assertFalse(Job.objects.exists())  # Nothing enqueued before commit
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Event.objects.filter(id=event_id).exists())
+        notify = Job.objects.get(name='notify_saved_users')
+        self.assertEqual(notify.payload['event_id'], event_id)
+        self.assertEqual(notify.payload['user_ids'], [self.saver.id])
+
+        self.run_all_jobs()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Event "Hackathon" was deleted')
+        self.assertEqual(mail.outbox[0].bcc, ['saver@example.com'])
+
+
+# ==================== EVENT STREAM (SSE) ====================
+
+class EventStreamTests(SimpleTestCase):
+    """
+    Drive the SSE ASGI app directly with fake receive/send callables.
+    """
+
+    def stream_scope(self, query_string=b''):
+        return {
+            'type': 'http',
+            'path': STREAM_PATH,
+            'method': 'GET',
+            'headers': [],
+            'query_string': query_string,
+        }
+
+    def test_thousands_of_subscribers_on_one_loop(self):
+        subscribers = 3000
+        hub = Broadcast()
+        app = EventStreamApp(django_app=None, hub=hub)
+        frame = encode_frame('event.approved', {'id': 1, 'is_approved': True})
+
+        async def scenario():
+            disconnect = asyncio.Event()
+            received = []
+            all_received = asyncio.Event()
+
+            async def client():
+                async def receive():
+                    await disconnect.wait()
+                    return {'type': 'http.disconnect'}
+
+                async def send(message):
+                    if message.get('body') == frame:
+                        received.append(1)
+                        if len(received) == subscribers:
+                            all_received.set()
+
+                await app(self.stream_scope(), receive, send)
+
+            clients = [asyncio.ensure_future(client()) for _ in range(subscribers)]
+            while hub.subscriber_count() < subscribers:
+                await asyncio.sleep(0.01)
+
+            # Views publish from a worker thread, not the event loop
+            started = time.perf_counter()
+            publisher = threading.Thread(target=hub.publish, args=(PUBLIC_CHANNEL, frame))
+            publisher.start()
+            publisher.join()
+            await asyncio.wait_for(all_received.wait(), timeout=10)
+            elapsed = time.perf_counter() - started
+
+            disconnect.set()
+            await asyncio.wait_for(asyncio.gather(*clients), timeout=10)
+            return len(received), elapsed
+
+        delivered, elapsed = asyncio.run(scenario())
+
+        self.assertEqual(delivered, subscribers)
+        self.assertLess(elapsed, 2)
+        self.assertEqual(hub.subscriber_count(), 0)
+
+    def test_changes_are_routed_by_audience(self):
+        hub = Broadcast()
+        app = EventStreamApp(django_app=None, hub=hub)
+        users = {
+            b'token=creator': SimpleNamespace(id=1, is_admin=False),
+            b'token=other': SimpleNamespace(id=2, is_admin=False),
+            b'token=admin': SimpleNamespace(id=3, is_admin=True),
+        }
+
+        async def authenticate(scope):
+            return users.get(scope['query_string'])
+
+        async def scenario():
+            disconnect = asyncio.Event()
+            received = {name: [] for name in ['anonymous', 'creator', 'other', 'admin']}
+
+            async def client(name, query_string):
+                async def receive():
+                    await disconnect.wait()
+                    return {'type': 'http.disconnect'}
+
+                async def send(message):
+                    if message.get('body', b'').startswith(b'event:'):
+                        received[name].append(message['body'].split(b'\n')[0])
+
+                await app(self.stream_scope(query_string), receive, send)
+
+            clients = [
+                asyncio.ensure_future(client(name, b'' if name == 'anonymous' else b'token=' + name.encode()))
+                for name in received
+            ]
+            while hub.subscriber_count() < 4:
+                await asyncio.sleep(0.01)
+
+            # Views publish from a worker thread, not the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, publish_event_change, 10, 1, 'created', False)
+            await loop.run_in_executor(None, publish_event_change, 10, 1, 'approved', True)
+            await asyncio.sleep(0.05)
+
+            disconnect.set()
+            await asyncio.gather(*clients)
+            return received
+
+        with mock.patch.object(app, 'authenticate', authenticate), \
+                mock.patch('api.broadcast._hub', hub):
+            received = asyncio.run(scenario())
+
+        self.assertEqual(received['anonymous'], [b'event: event.approved'])
+        self.assertEqual(received['other'], [b'event: event.approved'])
+        self.assertEqual(received['creator'], [b'event: event.created', b'event: event.approved'])
+        self.assertEqual(received['admin'], [b'event: event.created', b'event: event.approved'])
+
+    def test_invalid_token_is_rejected(self):
+        hub = Broadcast()
+        app = EventStreamApp(django_app=None, hub=hub)
+        messages = []
+
+        async def receive():
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(app(self.stream_scope(b'token=not-a-jwt'), receive, send))
+
+        self.assertEqual(messages[0]['status'], 401)
+        self.assertEqual(hub.subscriber_count(), 0)
+
+
+# ==================== VENUES ====================
+
+@override_settings(CACHES=TEST_CACHES)
+class VenueTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='user@example.com', username='user', password='pw')
+
+    def create_event(self, location, is_approved=True):
+        return Event.objects.create(
+            title='Event', description='...', date=timezone.now(),
+            location=location, creator=self.user, is_approved=is_approved,
+        )
+
+    def backfill(self):
+        call_command('backfill_venues', batch_size=2, stdout=io.StringIO())
+
+    def test_backfill_dedupes_locations(self):
+        for location in ['Main Hall', '  main   HALL ', 'Gym', '101']:
+            self.create_event(location)
+
+        self.backfill()
+
+        self.assertEqual(
+            sorted(Venue.objects.values_list('normalized_name', flat=True)),
+            ['101', 'gym', 'main hall'],
+        )
+        self.assertFalse(Event.objects.filter(venue__isnull=True).exists())
+        self.assertEqual(Venue.objects.get(normalized_name='main hall').events.count(), 2)
+
+    def test_filter_by_venue_name(self):
+        self.create_event('Main Hall')
+        self.create_event('main hall')
+        self.create_event('Gym')
+        self.create_event('101')
+        self.backfill()
+
+        response = self.client.get('/api/events/', {'venue': 'MAIN  Hall'})
+        self.assertEqual(response.data['count'], 2)
+
+        # Numeric names are names, not ids
+        response = self.client.get('/api/events/', {'venue': '101'})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['events'][0]['location'], '101')
+
+    def test_filter_by_venue_id(self):
+        self.create_event('Gym')
+        self.create_event('Main Hall')
+        self.backfill()
+        gym = Venue.objects.get(normalized_name='gym')
+
+        response = self.client.get('/api/events/', {'venue_id': gym.id})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['events'][0]['venue_name'], 'Gym')
+
+    def test_invalid_venue_id_is_rejected(self):
+        for venue_id in ['abc', '\u00b2', '0', '99999999999999999999999']:
+            response = self.client.get('/api/events/', {'venue_id': venue_id})
+            self.assertEqual(response.status_code, 400)
+
+    def test_normalized_name_fits_after_casefold_expansion(self):
+        location = '\ufb03' * 300  # Each 'ﬃ' casefolds to 'ffi'
+        venue = Venue.for_location(location)
+
+        max_length = Venue._meta.get_field('normalized_name').max_length
+        self.assertEqual(len(venue.normalized_name), 900)
+        self.assertLessEqual(len(venue.normalized_name), max_length)
+
+    def test_facet_counts_approved_events_per_venue(self):
+        self.create_event('Main Hall')
+        self.create_event('main hall')
+        self.create_event('Gym')
+        self.create_event('Gym', is_approved=False)
+        self.backfill()
+
+        response = self.client.get('/api/events/venues/')
+
+        self.assertEqual(
+            [(venue['name'], venue['count']) for venue in response.data['venues']],
+            [('Main Hall', 2), ('Gym', 1)],
+        )
+
+    def test_facets_refresh_after_invalidation(self):
+        self.create_event('Gym')
+        self.backfill()
+        self.client.get('/api/events/venues/')
+
+        event = self.create_event('Gym')
+        event.venue = Venue.objects.get()
+        event.save()
+        self.assertEqual(self.client.get('/api/events/venues/').data['venues'][0]['count'], 1)
+
+        invalidate_event_caches()
+        self.assertEqual(self.client.get('/api/events/venues/').data['venues'][0]['count'], 2)
+
+
+# ==================== BULK USER IMPORT ====================
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserImportTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='pw', is_admin=True
+        )
+
+    def row(self, n, **overrides):
+        return {'email': f'student{n}@uni.edu', 'username': f'student{n}',
+                'password': f'Str0ng-pass-{n}', **overrides}
+
+    def test_creates_users_with_usable_passwords(self):
+        report = provision_users([self.row(1), self.row(2)], workers=1)
+
+        self.assertEqual(report, {'created': 2, 'duplicates': [], 'errors': []})
+        self.assertTrue(User.objects.get(email='student1@uni.edu').check_password('Str0ng-pass-1'))
+
+    def test_hashes_across_a_process_pool(self):
+        report = provision_users([self.row(n) for n in range(6)], workers=2, batch_size=4)
+
+        self.assertEqual(report['created'], 6)
+        self.assertTrue(User.objects.get(email='student5@uni.edu').check_password('Str0ng-pass-5'))
+
+    def test_duplicate_emails_are_reported_not_fatal(self):
+        rows = [
+            self.row(1),
+            self.row(2, email='student1@uni.edu'),  # Duplicate within the roster
+            self.row(3, email='admin@example.com'),  # Already registered
+            self.row(4),
+        ]
+        report = provision_users(rows, workers=1)
+
+        self.assertEqual(report['created'], 2)
+        self.assertEqual([d['row'] for d in report['duplicates']], [2, 3])
+        self.assertEqual(report['errors'], [])
+
+    def test_invalid_rows_are_reported(self):
+        rows = [
+            self.row(1, email='not-an-email'),
+            self.row(2, password='123'),
+            self.row(3, username='admin'),  # Username taken
+            'not a row',
+            self.row(5),
+        ]
+        report = provision_users(rows, workers=1)
+
+        self.assertEqual(report['created'], 1)
+        errors = {error['row']: error['errors'] for error in report['errors']}
+        self.assertEqual(sorted(errors), [1, 2, 3, 4])
+        self.assertIn('email', errors[1])
+        self.assertIn('password', errors[2])
+        self.assertIn('username', errors[3])
+        self.assertIn('non_field_errors', errors[4])
+
+    def test_race_with_signup_reports_the_failed_constraint(self):
+        User.objects.create_user(email='other@uni.edu', username='student1', password='pw')
+        User.objects.create_user(email='student2@uni.edu', username='other', password='pw')
+
+        # Simulate the signups landing after the roster's uniqueness check
+        with mock.patch('api.provisioning._existing', return_value=set()):
+            report = provision_users([self.row(1), self.row(2), self.row(3)], workers=1)
+
+        self.assertEqual(report['created'], 1)
+        self.assertEqual(report['duplicates'], [{'row': 2, 'email': 'student2@uni.edu'}])
+        self.assertEqual(report['errors'][0]['row'], 1)
+        self.assertIn('username', report['errors'][0]['errors'])
+
+    def test_endpoint_reports_bad_entries(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        response = client.post('/api/admin/users/import/', {'users': ['x', self.row(1)]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['row'], 1)
+
+    def test_endpoint_caps_rows_per_request(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        rows = [self.row(n) for n in range(101)]
+
+        response = client.post('/api/admin/users/import/', {'users': rows}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_read_roster_stops_at_limit(self):
+        roster = io.StringIO('email,username,password\n' + 'a@b.c,a,pw\n' * 1000)
+
+        self.assertEqual(len(read_roster(roster, limit=3)), 3)
+
+    def test_endpoint_caps_csv_uploads(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        lines = ['email,username,password'] + [
+            f"{row['email']},{row['username']},{row['password']}"
+            for row in (self.row(n) for n in range(500))
+        ]
+        upload = SimpleUploadedFile('roster.csv', '\n'.join(lines).encode())
+
+        with mock.patch('api.views.read_roster', wraps=read_roster) as reader:
+            response = client.post('/api/admin/users/import/', {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(reader.call_args.kwargs['limit'], 101)
+
+    def test_endpoint_hashes_in_process(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        with mock.patch('api.provisioning.ProcessPoolExecutor') as pool:
+            response = client.post(
+                '/api/admin/users/import/', {'users': [self.row(n) for n in range(5)]}, format='json'
+            )
+
+        self.assertEqual(response.data['created'], 5)
+        pool.assert_not_called()
+
+    def test_endpoint_is_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(email='u@uni.edu', username='u', password='pw'))
+
+        response = client.post('/api/admin/users/import/', {'users': [self.row(1)]}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+
+
+# ==================== EVENT FRAGMENT CACHE ====================
+
+@override_settings(CACHES=TEST_CACHES)
+class EventFragmentCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        caches['counters'].clear()
+        # Drop counts left pending by earlier tests and restart the
+        # flush interval
+        flush_cache_stats()
+        CacheCounter.objects.all().delete()
+        self.user = User.objects.create_user(email='user@example.com', username='user', password='pw')
+        self.admin = User.objects.create_user(
+            email='admin@example.com', username='admin', password='pw', is_admin=True
+        )
+        self.events = [
+            Event.objects.create(
+                title=f'Event {n}', description='...', date=timezone.now(),
+                location='Gym', creator=self.user, is_approved=True,
+            )
+            for n in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(self.admin)
+
+    def list_events(self, client=None, **params):
+        response = (client or self.client).get('/api/events/', params)
+        return {event['id']: event for event in response.data['events']}
+
+    def test_warm_list_is_served_from_cache(self):
+        self.list_events()
+        self.list_events()
+
+        stats = cache_stats()['fragments']
+        self.assertEqual((stats['hits'], stats['misses']), (3, 3))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_stats_are_not_written_per_request(self):
+        self.list_events()
+        self.list_events()
+        self.assertFalse(CacheCounter.objects.exists())
+
+        with mock.patch.object(fragments, 'STATS_FLUSH_INTERVAL', 0):
+            self.list_events()
+            self.list_events()
+        counter = CacheCounter.objects.get(name='fragments')
+        self.assertEqual((counter.hits, counter.misses), (9, 3))
+        self.assertEqual(cache_stats()['saved_ids']['hits'], 3)
+
+    def test_cold_list_uses_a_fixed_number_of_queries(self):
+        for n in range(3, 50):
+            Event.objects.create(
+                title=f'Event {n}', description='...', date=timezone.now(),
+                location='Gym', creator=self.user, is_approved=True,
+            )
+
+        # Event rows, the user's saved IDs, then one fetch for all misses
+        with self.assertNumQueries(3):
+            self.assertEqual(len(self.list_events()), 50)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(self.list_events()), 50)
+
+    def test_approval_refreshes_only_that_event(self):
+        self.list_events(self.admin_client, show_all='true')
+        event = self.events[0]
+
+        response = self.admin_client.patch(
+            f'/api/events/{event.id}/approve/', {'is_approved': False}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        events = self.list_events(self.admin_client, show_all='true')
+
+        self.assertFalse(events[event.id]['is_approved'])
+        self.assertEqual(cache_stats()['fragments']['misses'], 3 + 1)
+        self.assertNotIn(event.id, self.list_events())
+
+    def test_creator_rename_is_not_served_stale(self):
+        self.list_events()
+        self.user.username = 'renamed'
+        self.user.save()
+
+        events = self.list_events()
+
+        self.assertTrue(all(event['creator_name'] == 'renamed' for event in events.values()))
+
+    def test_is_saved_overlay_follows_toggles(self):
+        event = self.events[1]
+        self.assertFalse(self.list_events()[event.id]['is_saved'])
+
+        self.client.post(f'/api/saved-events/{event.id}/toggle/')
+        events = self.list_events()
+        self.assertTrue(events[event.id]['is_saved'])
+        self.assertFalse(events[self.events[0].id]['is_saved'])
+
+        # Same fragments, different overlay per user
+        self.assertFalse(self.list_events(self.admin_client)[event.id]['is_saved'])
+
+        self.client.post(f'/api/saved-events/{event.id}/toggle/')
+        self.assertFalse(self.list_events()[event.id]['is_saved'])
+
+    def test_saved_events_list(self):
+        event = self.events[2]
+        self.client.post(f'/api/saved-events/{event.id}/toggle/')
+
+        response = self.client.get('/api/saved-events/')
+
+        self.assertEqual(response.data['count'], 1)
+        saved = response.data['saved_events'][0]
+        self.assertEqual(saved['event']['id'], event.id)
+        self.assertTrue(saved['event']['is_saved'])
+        self.assertEqual(saved['event']['creator_name'], 'user')
+
+    def test_venue_backfill_replaces_cached_fragments(self):
+        self.list_events()
+        call_command('backfill_venues', stdout=io.StringIO())
+
+        events = self.list_events()
+
+        venue_id = Venue.objects.get().id
+        self.assertTrue(all(event['venue'] == venue_id for event in events.values()))
+        self.assertTrue(all(event['venue_name'] == 'Gym' for event in events.values()))
+
+    def test_list_matches_event_serializer(self):
+        event = self.events[0]
+        listed = self.list_events()[event.id]
+        detail = self.client.get(f'/api/events/{event.id}/').data
+
+        self.assertEqual(dict(listed), dict(detail))
@@ -4,8 +4,10 @@ from .views import (
     SignupView,
     LoginView,
     LogoutView,
+    UserImportView,
     # Event views
     EventListView,
+    EventVenueFacetView,
     EventCreateView,
     EventDetailView,
     EventDeleteView,
@@ -13,6 +15,8 @@ from .views import (
     # Saved events views
     SavedEventListView,
     SavedEventToggleView,
+    # Cache views
+    CacheStatsView,
 )
 
 urlpatterns = [
@@ -20,9 +24,11 @@ urlpatterns = [
     path('auth/signup/', SignupView.as_view(), name='signup'),
     path('auth/login/', LoginView.as_view(), name='login'),
     path('auth/logout/', LogoutView.as_view(), name='logout'),
+    path('admin/users/import/', UserImportView.as_view(), name='user-import'),
     
     # Event endpoints
     path('events/', EventListView.as_view(), name='event-list'),
+    path('events/venues/', EventVenueFacetView.as_view(), name='event-venues'),
     path('events/create/', EventCreateView.as_view(), name='event-create'),
     path('events/<int:event_id>/', EventDetailView.as_view(), name='event-detail'),
     path('events/<int:event_id>/delete/', EventDeleteView.as_view(), name='event-delete'),
@@ -31,4 +37,7 @@ urlpatterns = [
     # Saved events endpoints
     path('saved-events/', SavedEventListView.as_view(), name='saved-events-list'),
     path('saved-events/<int:event_id>/toggle/', SavedEventToggleView.as_view(), name='saved-event-toggle'),
+    
+    # Cache endpoints
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
 ]
\ No newline at end of file
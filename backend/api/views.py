@@ -1,16 +1,24 @@
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 
 from .serializers import (
     UserSignupSerializer, UserLoginSerializer, UserSerializer,
     EventSerializer, EventCreateSerializer, SavedEventSerializer
 )
-from .models import Event, SavedEvent
+from .models import Event, SavedEvent, normalize_venue_name
+from .jobs import enqueue_event_changed, events_cache_version
+from .broadcast import publish_event_change
+from .provisioning import provision_users, read_roster
+from .fragments import (
+    cache_stats, event_row_fields, invalidate_saved_event_ids, render_events, saved_event_ids,
+)
 
 User = get_user_model()
 
@@ -88,6 +96,53 @@ class LogoutView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+class UserImportView(APIView):
+    """
+    POST /api/admin/users/import/
+    
+    Bulk create users. Only admins can import.
+    
+    Body: multipart with a CSV `file` (email, username, password columns)
+    or JSON { "users": [{ "email", "username", "password" }, ...] }
+    
+    Invalid rows and duplicate emails are reported, not fatal.
+    At most `max_rows` users per request, hashed in this process (no
+    process pool inside a threaded web server); larger rosters go
+    through `manage.py import_users`.
+    """
+    permission_classes = [IsAuthenticated]
+    max_rows = 100
+    
+    def post(self, request):
+        if not request.user.is_admin:
+            return Response({
+                'error': 'Only admins can import users'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        if 'file' in request.FILES:
+            # One row past the limit is enough to reject the upload
+            rows = read_roster(request.FILES['file'], limit=self.max_rows + 1)
+        else:
+            rows = request.data.get('users')
+            if not isinstance(rows, list):
+                return Response({
+                    'error': 'Upload a CSV file or send a users list'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if len(rows) > self.max_rows:
+            return Response({
+                'error': f'At most {self.max_rows} users per request. '
+                         'Use `manage.py import_users` for larger rosters.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        report = provision_users(rows, workers=1)
+        
+        return Response({
+            'message': f"Created {report['created']} of {len(rows)} users",
+            **report
+        }, status=status.HTTP_200_OK)
+
+
 # ==================== EVENT VIEWS ====================
 
 class EventListView(APIView):
@@ -99,6 +154,8 @@ class EventListView(APIView):
     
     Query parameters:
     - show_all=true (admin only) - shows all events including unapproved
+    - venue=<name> - only events at that venue (matched case/space-insensitively)
+    - venue_id=<id> - only events at the venue with that id
     """
     permission_classes = [AllowAny]
     
@@ -113,15 +170,61 @@ class EventListView(APIView):
             # Regular users only see approved events
             events = Event.objects.filter(is_approved=True)
         
-        serializer = EventSerializer(
-            events,
-            many=True,
-            context={'request': request}
-        )
+        venue_id = request.query_params.get('venue_id')
+        if venue_id:
+            try:
+                venue_id = serializers.IntegerField(min_value=1, max_value=2**63 - 1).run_validation(venue_id)
+            except serializers.ValidationError:
+                return Response({
+                    'error': 'venue_id must be a positive integer'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            events = events.filter(venue_id=venue_id)
+        
+        venue = request.query_params.get('venue')
+        if venue:
+            events = events.filter(venue__normalized_name=normalize_venue_name(venue))
+        
+        # Only ids/timestamps come from the database; the event data
+        # itself is served from the per-event fragment cache
+        rows = list(events.values_list(*event_row_fields()))
+        data = render_events(rows, saved_event_ids(request.user))
+        
+        return Response({
+            'events': data,
+            'count': len(data)
+        }, status=status.HTTP_200_OK)
+
+
+class EventVenueFacetView(APIView):
+    """
+    GET /api/events/venues/
+    
+    Number of approved events per venue, for venue filters.
+    Anyone can view.
+    
+    Counts come from one grouped query and are cached until the next
+    event change (see jobs.invalidate_event_caches).
+    """
+    permission_classes = [AllowAny]
+    cache_timeout = 60 * 10
+    
+    def get(self, request):
+        cache_key = f'events:venue-facets:v{events_cache_version()}'
+        venues = cache.get(cache_key)
+        
+        if venues is None:
+            venues = [
+                {'id': row['venue_id'], 'name': row['venue__name'], 'count': row['count']}
+                for row in Event.objects.filter(is_approved=True, venue__isnull=False)
+                .values('venue_id', 'venue__name')
+                .annotate(count=Count('id'))
+                .order_by('-count', 'venue__name')
+            ]
+            cache.set(cache_key, venues, self.cache_timeout)
         
         return Response({
-            'events': serializer.data,
-            'count': events.count()
+            'venues': venues,
+            'count': len(venues)
         }, status=status.HTTP_200_OK)
 
 
@@ -143,6 +246,8 @@ class EventCreateView(APIView):
         
         if serializer.is_valid():
             event = serializer.save()
+            enqueue_event_changed(event.id, event.title, 'created')
+            publish_event_change(event.id, event.creator_id, 'created', event.is_approved)
             
             return Response({
                 'message': 'Event created successfully. Waiting for admin approval.',
@@ -201,8 +306,16 @@ class EventDeleteView(APIView):
                 'error': 'You do not have permission to delete this event'
             }, status=status.HTTP_403_FORBIDDEN)
         
+        event_id = event.id
         event_title = event.title
+        saved_user_ids = list(
+            SavedEvent.objects.filter(event=event).values_list('user_id', flat=True)
+        )
+        creator_id = event.creator_id
+        was_approved = event.is_approved
         event.delete()
+        enqueue_event_changed(event_id, event_title, 'deleted', saved_user_ids=saved_user_ids)
+        publish_event_change(event_id, creator_id, 'deleted', False, was_approved=was_approved)
         
         return Response({
             'message': f'Event "{event_title}" deleted successfully'
@@ -235,10 +348,15 @@ class EventApproveView(APIView):
                 'error': 'is_approved field is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        was_approved = event.is_approved
         event.is_approved = is_approved
         event.save()
         
         status_text = 'approved' if is_approved else 'rejected'
+        enqueue_event_changed(event.id, event.title, status_text)
+        publish_event_change(
+            event.id, event.creator_id, status_text, event.is_approved, was_approved=was_approved
+        )
         
         return Response({
             'message': f'Event "{event.title}" {status_text}',
@@ -257,12 +375,30 @@ class SavedEventListView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        saved_events = SavedEvent.objects.filter(user=request.user)
-        serializer = SavedEventSerializer(saved_events, many=True)
+        saved_events = list(
+            SavedEvent.objects.filter(user=request.user)
+            .values_list('id', 'saved_at', *event_row_fields('event__'))
+        )
+        events = render_events(
+            [row[2:] for row in saved_events],
+            saved_ids={row[2] for row in saved_events}
+        )
+        events_by_id = {event['id']: event for event in events}
+        saved_at_field = SavedEventSerializer().fields['saved_at']
+        
+        data = [
+            {
+                'id': saved_id,
+                'event': events_by_id[event_id],
+                'saved_at': saved_at_field.to_representation(saved_at),
+            }
+            for saved_id, saved_at, event_id, *_ in saved_events
+            if event_id in events_by_id
+        ]
         
         return Response({
-            'saved_events': serializer.data,
-            'count': saved_events.count()
+            'saved_events': data,
+            'count': len(data)
         }, status=status.HTTP_200_OK)
 
 
@@ -294,6 +430,7 @@ class SavedEventToggleView(APIView):
         if saved_event:
             # Unsave
             saved_event.delete()
+            invalidate_saved_event_ids(request.user.id)
             return Response({
                 'message': f'Event "{event.title}" removed from saved events',
                 'is_saved': False
@@ -304,7 +441,28 @@ class SavedEventToggleView(APIView):
                 user=request.user,
                 event=event
             )
+            invalidate_saved_event_ids(request.user.id)
             return Response({
                 'message': f'Event "{event.title}" saved successfully',
                 'is_saved': True
-            }, status=status.HTTP_201_CREATED)
\ No newline at end of file
+            }, status=status.HTTP_201_CREATED)
+
+
+# ==================== CACHE STATS ====================
+
+class CacheStatsView(APIView):
+    """
+    GET /api/cache/stats/
+    
+    Hit rates of the event fragment and saved-events caches.
+    Only admins can view.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        if not request.user.is_admin:
+            return Response({
+                'error': 'Only admins can view cache stats'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        return Response(cache_stats(), status=status.HTTP_200_OK)
\ No newline at end of file
@@ -2,4 +2,9 @@
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cems_backend.settings')
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up; serves /api/events/stream/ (SSE)
+from api.sse import EventStreamApp  # noqa: E402
+
+application = EventStreamApp(django_application)
@@ -1,4 +1,5 @@
 ﻿from pathlib import Path
+import tempfile
 from datetime import timedelta
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -72,6 +73,40 @@ TIME_ZONE = 'UTC'
 USE_I18N = True
 USE_TZ = True
 
+# Cache versions live in the small file-based 'counters' cache, shared
+# with `manage.py run_workers` so invalidation done by background jobs is
+# visible to the API. Kept out of the source tree.
+CACHE_DIR = Path(tempfile.gettempdir()) / 'cems-cache'
+
+CACHES = {
+    # Event fragments, saved-event IDs and venue facets (see api/fragments.py).
+    # LocMem is per process, which is fine for a single dev server. When
+    # running several web processes a shared Redis/Memcached is required
+    # (e.g. 'django.core.cache.backends.redis.RedisCache'), so a save/unsave
+    # invalidates every process. Don't use FileBasedCache here: it scans
+    # its whole directory on every write, once per event on a cold list.
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'cems',
+        # One entry per event fragment plus one per user's saved IDs
+        'OPTIONS': {'MAX_ENTRIES': 100_000},
+    },
+    # A handful of version keys that must never be culled; few enough
+    # files that the file backend's per-write directory scan is cheap
+    'counters': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'counters',
+    },
+}
+
+# Pub/sub for the SSE stream. Use 'api.broadcast.RedisBackend' (with
+# CEMS_BROADCAST_OPTIONS = {'url': ...}) when running several ASGI processes.
+CEMS_BROADCAST_BACKEND = 'api.broadcast.LocalBackend'
+CEMS_BROADCAST_OPTIONS = {}
+
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'noreply@cems.local'
+
 STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 